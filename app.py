@@ -1,16 +1,29 @@
-from flask import Flask, render_template, request, redirect, session
+from flask import (Flask, render_template, request, redirect, session, jsonify,
+                   url_for, abort, send_from_directory, g)
 from werkzeug.security import generate_password_hash, check_password_hash
 import sqlite3
+import os
+import json
+import mimetypes
 import pandas as pd
 import joblib
-from datetime import datetime
+from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
-import schedule
 import threading
-import time
 import smtplib
 from email.mime.text import MIMEText
-import math
+from inventory_store import safe_qty, apply_stock_change
+from partitioned_inventory import PartitionedInventory, load_site_map
+from inventory_reports import stock_valuation, supplier_reorders, site_summary, combine_site_summaries
+from expiry_index import ExpiryIndex
+from session_store import SqliteSessionInterface
+from user_cache import UserCache
+from dashboard_data import build_sales_aggregates, stock_forecast_gaps, json_etag
+from job_scheduler import JobScheduler, acquire_or_wait
+from forecasting import horizon_forecast, reorder_plan
+from forecast_engine import ForecastEngine
+from forecast_table import (init_forecast_table, model_version, current_version,
+                            materialize_forecasts, lookup_forecast, lookup_month)
 
 app = Flask(__name__)
 app.secret_key = "your_secret_key_here"
@@ -33,16 +46,25 @@ def init_db():
 
 init_db()
 
+# Sessions live in users.db; the cookie only carries a session id
+app.session_interface = SqliteSessionInterface("users.db")
+user_cache = UserCache("users.db")
+
 # ==========================
 # Load ML Model & Data
 # ==========================
-model = joblib.load("Stock_prediction_model.pkl")
-inventory_df = pd.read_csv("inventory_data.csv")
+MODEL_PATH = "Stock_prediction_model.pkl"
+model = joblib.load(MODEL_PATH)
+INVENTORY_PARTITION_DIR = os.environ.get("INVENTORY_PARTITION_DIR", "inventory_partitions")
+PARTITION_WORKERS = int(os.environ.get("PARTITION_WORKERS", "4"))
+PARTITION_KEY = os.environ.get("PARTITION_KEY", "Warehouse_Location")
+PARTITION_SITE_MAP = os.environ.get("PARTITION_SITE_MAP")
+inventory_store = PartitionedInventory.load("inventory_data.csv", INVENTORY_PARTITION_DIR, key=PARTITION_KEY,
+                                            site_map=load_site_map(PARTITION_SITE_MAP),
+                                            workers=PARTITION_WORKERS)
 sales_data = pd.read_csv("supermarket_sales.csv")
 sales_data['Date'] = pd.to_datetime(sales_data['Date'])
 
-if 'Product_ID' in inventory_df.columns:
-    inventory_df['Product_ID'] = inventory_df['Product_ID'].astype(str)
 if 'Product_ID' in sales_data.columns:
     sales_data['Product_ID'] = sales_data['Product_ID'].astype(str)
 
@@ -53,25 +75,40 @@ sales_monthly['Year'] = sales_monthly['Date'].dt.year
 sales_monthly['Month'] = sales_monthly['Date'].dt.month
 for lag in [1,2,3,6]:
     sales_monthly[f'Lag_{lag}'] = sales_monthly.groupby('Product_ID')['Units_Sold'].shift(lag)
+dashboard_aggregates = build_sales_aggregates(sales_monthly)
+# Every month of sales per product; the forecast rollout seeds its lags from here
+monthly_units = sales_monthly[['Product_ID','Product_Name','Category','Date','Units_Sold']].copy()
 sales_monthly.dropna(inplace=True)
 
+# ==========================
+# Materialized Forecasts
+# ==========================
+FORECAST_DB = os.environ.get("FORECAST_DB", "forecasts.db")
+FORECAST_MONTHS = int(os.environ.get("FORECAST_MONTHS", "12"))
+FORECAST_WORKERS = int(os.environ.get("FORECAST_WORKERS", "1"))
+# Longest on-demand rollout; each month ahead costs one model.predict
+MAX_FORECAST_MONTHS = 24
+FORECAST_VERSION = model_version(MODEL_PATH, monthly_units)
+forecast_engine = ForecastEngine(MODEL_PATH, workers=FORECAST_WORKERS, model=model)
+init_forecast_table(FORECAST_DB)
+
 LOW_STOCK_THRESHOLD = 25
+EXPIRY_ALERT_DAYS = int(os.environ.get("EXPIRY_ALERT_DAYS", "7"))
+expiry_index = ExpiryIndex(inventory_store.snapshot())
 
-def safe_qty(val):
-    try:
-        if val is None or (isinstance(val, float) and math.isnan(val)):
-            return 0
-        return int(val)
-    except:
-        return 0
+# Scheduler timings, overridable from the environment
+LOW_STOCK_CHECK_SECONDS = int(os.environ.get("LOW_STOCK_CHECK_SECONDS", "30"))
+END_OF_DAY_REPORT_TIME = os.environ.get("END_OF_DAY_REPORT_TIME", "22:57")
+MONTHLY_REPORT_TIME = os.environ.get("MONTHLY_REPORT_TIME", "22:58")
+FORECAST_REFRESH_TIME = os.environ.get("FORECAST_REFRESH_TIME", "02:00")
+SCHEDULER_LOCK = os.environ.get("SCHEDULER_LOCK", "scheduler.lock")
+SCHEDULER_DB = os.environ.get("SCHEDULER_DB", "scheduler.db")
 
 def get_all_users():
-    conn = sqlite3.connect("users.db")
-    cursor = conn.cursor()
-    cursor.execute("SELECT username,email,gmail_password FROM users")
-    users = cursor.fetchall()
-    conn.close()
-    return [{"username": u[0], "email": u[1], "gmail_password": u[2]} for u in users]
+    return user_cache.all()
+
+def months_ahead(last_date, prediction_year, prediction_month):
+    return (prediction_year * 12 + prediction_month) - (last_date.year * 12 + last_date.month)
 
 def predict_stock(product_id, prediction_year, prediction_month):
     product_sales = sales_monthly[sales_monthly['Product_ID'] == str(product_id)]
@@ -82,11 +119,23 @@ def predict_stock(product_id, prediction_year, prediction_month):
     product_name = last_row['Product_Name']
     category = last_row['Category']
 
-    lags = [last_row.get(f'Lag_{i}', 0) for i in [1,2,3,6]]
-    X_new = pd.DataFrame([[*lags, prediction_year, prediction_month]],
-                         columns=['Lag_1','Lag_2','Lag_3','Lag_6','Year','Month'])
-    future_sales = float(model.predict(X_new)[0])
-
+    steps = months_ahead(product_sales['Date'].max(), prediction_year, prediction_month)
+    stored = lookup_forecast(FORECAST_DB, FORECAST_VERSION, product_id, prediction_year, prediction_month)
+    if stored:
+        future_sales = float(stored['Predicted_Sales'])
+    elif steps > MAX_FORECAST_MONTHS:
+        raise ValueError(f"Predictions are limited to {MAX_FORECAST_MONTHS} months after the last sales month")
+    elif steps >= 1:
+        # Roll lags forward through the months in between
+        forecast = horizon_forecast(model, monthly_units, steps, product_ids=[product_id])
+        future_sales = float(forecast['Predicted_Sales'].iloc[-1])
+    else:
+        lags = [last_row.get(f'Lag_{i}', 0) for i in [1,2,3,6]]
+        X_new = pd.DataFrame([[*lags, prediction_year, prediction_month]],
+                             columns=['Lag_1','Lag_2','Lag_3','Lag_6','Year','Month'])
+        future_sales = float(model.predict(X_new)[0])
+
+    inventory_df = inventory_store.snapshot()
     current_stock_row = inventory_df[inventory_df['Product_ID'] == str(product_id)]
     current_stock = safe_qty(current_stock_row.iloc[0]['Stock_Quantity']) if not current_stock_row.empty else 0
     required_stock = max(0, future_sales - current_stock)
@@ -100,6 +149,32 @@ def predict_stock(product_id, prediction_year, prediction_month):
         'Required_Stock_to_Add': int(round(required_stock))
     }
 
+def predict_month_for_catalog(prediction_year, prediction_month):
+    """Forecast one month for every product with one model.predict per step."""
+    last_rows = sales_monthly.groupby('Product_ID').tail(1)
+    steps = months_ahead(last_rows['Date'].min(), prediction_year, prediction_month)
+    if steps < 1:
+        X_new = last_rows[['Lag_1','Lag_2','Lag_3','Lag_6']].assign(Year=prediction_year, Month=prediction_month)
+        return last_rows[['Product_ID', 'Product_Name']].assign(Predicted_Sales=model.predict(X_new))
+    stored = lookup_month(FORECAST_DB, FORECAST_VERSION, prediction_year, prediction_month)
+    if not stored.empty:
+        return stored
+    forecast = horizon_forecast(model, monthly_units, steps)
+    return forecast[(forecast['Year'] == prediction_year) & (forecast['Month'] == prediction_month)]
+
+def refresh_forecast_table():
+    """Materialize forecasts for every product through FORECAST_MONTHS from today."""
+    horizon = datetime.today() + relativedelta(months=FORECAST_MONTHS)
+    first_last_date = sales_monthly.groupby('Product_ID')['Date'].max().min()
+    steps = max(months_ahead(first_last_date, horizon.year, horizon.month), 1)
+    print(f" Materializing {steps} months of forecasts...")
+    try:
+        forecast = forecast_engine.horizon_forecast(monthly_units, steps)
+    finally:
+        forecast_engine.close()
+    rows = materialize_forecasts(FORECAST_DB, forecast, FORECAST_VERSION)
+    print(f" Stored {rows} forecast rows (version {FORECAST_VERSION})")
+
 # ==========================
 # Gmail Alert Function
 # ==========================
@@ -122,29 +197,36 @@ def send_gmail_alert(user, subject, message):
 # ==========================
 # Alert Functions
 # ==========================
-def low_stock_check():
-    global inventory_df
+def find_low_stock(inventory_df):
+    # Vectorized masks; message lines are built only for the matching rows
+    qty = pd.to_numeric(inventory_df['Stock_Quantity'], errors='coerce').fillna(0).astype(int)
+    out = (qty <= 0).to_numpy()
+    low = ((qty > 0) & (qty < LOW_STOCK_THRESHOLD)).to_numpy()
+    pids = inventory_df['Product_ID'].astype(str).to_numpy()
+    names = inventory_df['Product_Name'].to_numpy()
+    out_of_stock = [f"• {pname} (ID:{pid}) — OUT OF STOCK" for pid, pname in zip(pids[out], names[out])]
+    low_stock = [f"• {pname} (ID:{pid}) — {q} units left"
+                 for pid, pname, q in zip(pids[low], names[low], qty.to_numpy()[low])]
+    return out_of_stock, low_stock
+
+def low_stock_check(warehouse=None):
     print(" Running Low Stock Check...")
-    if inventory_df.empty:
+    if not inventory_store.sites():
         print(" Inventory empty")
         return
 
-    out_of_stock, low_stock = [], []
-
-    for _, row in inventory_df.iterrows():
-        qty = safe_qty(row.get('Stock_Quantity', 0))
-        pid = str(row.get('Product_ID', ''))
-        pname = row.get('Product_Name', 'Unknown')
-        if qty <= 0:
-            out_of_stock.append(f"• {pname} (ID:{pid}) — OUT OF STOCK")
-        elif qty < LOW_STOCK_THRESHOLD:
-            low_stock.append(f"• {pname} (ID:{pid}) — {qty} units left")
+    # Batches of warehouse partitions are scanned in parallel
+    results = inventory_store.map_batches(find_low_stock, [warehouse] if warehouse else None)
+    out_of_stock = [line for out, _ in results for line in out]
+    low_stock = [line for _, low in results for line in low]
 
     if not out_of_stock and not low_stock:
         print(" No low stock items found")
         return
 
     message = " LOW STOCK ALERT\n\n"
+    if warehouse:
+        message = f" LOW STOCK ALERT – {warehouse}\n\n"
     if out_of_stock:
         message += " OUT OF STOCK ITEMS:\n" + "\n".join(out_of_stock) + "\n\n"
     if low_stock:
@@ -154,8 +236,48 @@ def low_stock_check():
     for user in get_all_users():
         send_gmail_alert(user, "Inventory Low Stock Alert", message)
 
-def end_of_day_report():
-    global inventory_df
+def expiry_check():
+    print(" Running Expiry Check...")
+    today = datetime.today().date()
+    expiring = expiry_index.pop_expiring(today + timedelta(days=EXPIRY_ALERT_DAYS))
+    if not expiring:
+        print(" No expiring items found")
+        return
+
+    products = inventory_store.derived('by_product_id', lambda df: df.drop_duplicates('Product_ID').set_index('Product_ID'))
+    expired, expiring_soon, not_reported = [], [], []
+    for expiry_date, pid in expiring:
+        if pid not in products.index:
+            not_reported.append((expiry_date, pid))
+            continue
+        row = products.loc[pid]
+        qty = safe_qty(row.get('Stock_Quantity', 0))
+        if qty <= 0:
+            # Check again once it is restocked
+            not_reported.append((expiry_date, pid))
+            continue
+        if expiry_date < today:
+            expired.append(f"• {row['Product_Name']} (ID:{pid}) — expired {expiry_date}, {qty} units")
+        else:
+            expiring_soon.append(f"• {row['Product_Name']} (ID:{pid}) — expires {expiry_date}, {qty} units")
+    expiry_index.push(not_reported)
+
+    if not expired and not expiring_soon:
+        print(" No expiring items in stock")
+        return
+
+    message = " EXPIRY ALERT\n\n"
+    if expired:
+        message += " EXPIRED ITEMS:\n" + "\n".join(expired) + "\n\n"
+    if expiring_soon:
+        message += f" EXPIRING WITHIN {EXPIRY_ALERT_DAYS} DAYS:\n" + "\n".join(expiring_soon)
+
+    print(" Expiry alert triggered")
+    for user in get_all_users():
+        send_gmail_alert(user, "Inventory Expiry Alert", message)
+
+def end_of_day_report(warehouse=None):
+    inventory_df = inventory_store.partition(warehouse).snapshot() if warehouse else inventory_store.snapshot()
     print(" Running Daily Stock Report...")
     if inventory_df.empty:
         print(" Inventory empty")
@@ -172,7 +294,7 @@ def end_of_day_report():
         send_gmail_alert(user, f"Daily Stock Report – {today}", message)
 
 def monthly_prediction_report():
-    global inventory_df
+    inventory_df = inventory_store.snapshot()
     print(" Running Monthly Stock Forecast...")
     if inventory_df.empty:
         print(" Inventory empty")
@@ -183,10 +305,14 @@ def monthly_prediction_report():
     next_year = next_month_date.year
     message = f" MONTHLY STOCK FORECAST – {next_month}/{next_year}\n\n"
 
+    forecast = predict_month_for_catalog(next_year, next_month).set_index('Product_ID')
+    stock = inventory_df.drop_duplicates('Product_ID').set_index('Product_ID')['Stock_Quantity']
     for pid in inventory_df['Product_ID'].astype(str):
-        forecast = predict_stock(pid, next_year, next_month)
-        if forecast:
-            message += f"• {forecast['Product_Name']} (ID:{pid}) → Need {forecast['Required_Stock_to_Add']} units\n"
+        if pid not in forecast.index:
+            continue
+        row = forecast.loc[pid]
+        required = max(0, float(row['Predicted_Sales']) - safe_qty(stock.get(pid)))
+        message += f"• {row['Product_Name']} (ID:{pid}) → Need {int(round(required))} units\n"
 
     print(" Sending monthly forecast emails...")
     for user in get_all_users():
@@ -195,22 +321,101 @@ def monthly_prediction_report():
 # ==========================
 # Scheduler
 # ==========================
+job_scheduler = JobScheduler(stats_db=SCHEDULER_DB)
+
 def run_scheduler():
-    schedule.every(30).seconds.do(low_stock_check)
-    schedule.every().day.at("22:57").do(end_of_day_report)
-    schedule.every().day.at("22:58").do(monthly_prediction_report)
-    while True:
-        schedule.run_pending()
-        time.sleep(1)
+    job_scheduler.every(LOW_STOCK_CHECK_SECONDS).seconds.do(
+        job_scheduler.add_job("low_stock_check", low_stock_check, overlap="coalesce"))
+    job_scheduler.every(LOW_STOCK_CHECK_SECONDS).seconds.do(
+        job_scheduler.add_job("expiry_check", expiry_check, overlap="coalesce"))
+    job_scheduler.every().day.at(END_OF_DAY_REPORT_TIME).do(
+        job_scheduler.add_job("end_of_day_report", end_of_day_report))
+    job_scheduler.every().day.at(MONTHLY_REPORT_TIME).do(
+        job_scheduler.add_job("monthly_prediction_report", monthly_prediction_report))
+    job_scheduler.every().day.at(FORECAST_REFRESH_TIME).do(
+        job_scheduler.add_job("refresh_forecast_table", refresh_forecast_table))
+    if current_version(FORECAST_DB) != FORECAST_VERSION:
+        job_scheduler.dispatch("refresh_forecast_table")
+    job_scheduler.run_forever()
+
+_scheduler_lock_file = None
+
+def start_scheduler():
+    """Run the scheduler in exactly one process.
+
+    An flock on SCHEDULER_LOCK designates the process. Every other process
+    keeps a thread waiting on the lock, so when the scheduler process exits
+    (including during a gunicorn reload) one of them takes over.
+    """
+    global _scheduler_lock_file
+    if _scheduler_lock_file is not None:
+        return
+    _scheduler_lock_file = acquire_or_wait(SCHEDULER_LOCK, launch_scheduler)
+
+def launch_scheduler():
+    threading.Thread(target=run_scheduler, daemon=True).start()
+    print(f" Scheduler started in process {os.getpid()}")
+
+# ==========================
+# Static Assets
+# ==========================
+# Built by build_assets.py; without a manifest templates fall back to /static
+ASSET_DIR = os.path.join(app.static_folder, "dist")
+ASSET_MAX_AGE = 365 * 24 * 3600
+
+def load_asset_manifest():
+    try:
+        with open(os.path.join(ASSET_DIR, "manifest.json")) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+asset_manifest = load_asset_manifest()
+asset_files = {entry['file']: entry for entry in asset_manifest.values()}
+
+@app.context_processor
+def asset_helpers():
+    def asset_url(filename):
+        entry = asset_manifest.get(filename)
+        if entry is None:
+            return url_for('static', filename=filename)
+        return url_for('assets', filename=entry['file'])
+    return {'asset_url': asset_url}
+
+@app.route('/assets/<path:filename>')
+def assets(filename):
+    entry = asset_files.get(filename)
+    if entry is None:
+        abort(404)
+    served, encoding = filename, None
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    if 'webp' in entry and any(m == 'image/webp' for m, _ in request.accept_mimetypes):
+        served, mimetype = entry['webp'], 'image/webp'
+    elif 'gzip_size' in entry and request.accept_encodings['gzip']:
+        served, encoding = filename + '.gz', 'gzip'
+    response = send_from_directory(ASSET_DIR, served, mimetype=mimetype, max_age=ASSET_MAX_AGE)
+    # Fingerprinted names change with content, so the response never goes stale
+    response.headers['Cache-Control'] = f'public, max-age={ASSET_MAX_AGE}, immutable'
+    response.headers['Vary'] = 'Accept, Accept-Encoding'
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    return response
 
 # ==========================
 # Flask Routes
 # ==========================
+@app.before_request
+def load_user():
+    user_id = session.get('user_id')
+    g.user = user_cache.get(user_id) if user_id is not None else None
+    if user_id is not None and g.user is None:
+        session.clear()
+
 @app.route("/")
 def index():
-    if 'user' not in session:
+    if g.user is None:
         return redirect('/intro')
-    return render_template("Main.html", username=session['user']['username'])
+    return render_template("Main.html", username=g.user['username'])
 
 @app.route('/signup', methods=['GET','POST'])
 def signup():
@@ -225,6 +430,7 @@ def signup():
             cursor.execute("INSERT INTO users (username,email,gmail_password,password) VALUES (?,?,?,?)",
                            (username,email,gmail_password,password))
             conn.commit()
+            user_cache.invalidate()
         except sqlite3.IntegrityError:
             conn.close()
             return "Email already exists"
@@ -243,7 +449,9 @@ def login():
         user = cursor.fetchone()
         conn.close()
         if user and check_password_hash(user[4], password):
-            session['user'] = {"id": user[0], "username": user[1], "email": user[2], "gmail_password": user[3]}
+            session.clear()
+            session.regenerate()
+            session['user_id'] = user[0]
             return redirect('/')
         else:
             return "Invalid credentials"
@@ -251,40 +459,143 @@ def login():
 
 @app.route('/logout')
 def logout():
-    session.pop('user', None)
+    session.pop('user_id', None)
     return redirect('/login')
 
 @app.route('/manual_prediction', methods=['GET','POST'])
 def manual_prediction():
-    if 'user' not in session:
+    if g.user is None:
         return redirect('/login')
     forecast = None
     if request.method=='POST':
         product_id = str(request.form['product_id'])
-        month = int(request.form['month'])
-        year = int(request.form['year'])
-        forecast = predict_stock(product_id, year, month)
-    return render_template("manual_prediction.html", forecast=forecast, username=session['user']['username'])
+        try:
+            month = int(request.form['month'])
+            year = int(request.form['year'])
+            if not 1 <= month <= 12:
+                raise ValueError("Month must be between 1 and 12")
+            forecast = predict_stock(product_id, year, month)
+        except ValueError as e:
+            abort(400, description=str(e))
+    return render_template("manual_prediction.html", forecast=forecast, username=g.user['username'])
 
 @app.route('/add_inventory', methods=['GET','POST'])
 def add_inventory():
-    if 'user' not in session:
+    if g.user is None:
         return redirect('/login')
     if request.method=='POST':
         product_id = str(request.form['product_id'])
         change = int(request.form['change'])
-        global inventory_df
-        idx = inventory_df[inventory_df['Product_ID'].astype(str) == product_id].index
-        if not idx.empty:
-            inventory_df.loc[idx, 'Stock_Quantity'] = inventory_df.loc[idx, 'Stock_Quantity'].apply(safe_qty) + change
-            inventory_df.to_csv("inventory_data.csv", index=False)
-    return render_template("add_inventory.html", username=session['user']['username'])
+        inventory_store.update_product(product_id, lambda df: apply_stock_change(df, product_id, change))
+    return render_template("add_inventory.html", username=g.user['username'])
 
 @app.route('/dashboards')
 def dashboards():
-    if 'user' not in session:
+    if g.user is None:
         return redirect('/login')
-    return render_template("dashboards.html", username=session['user']['username'])
+    return render_template("dashboards.html", username=g.user['username'])
+
+def stock_gaps_with_etag(inventory_df, year, month):
+    gaps = stock_forecast_gaps(inventory_df, predict_month_for_catalog(year, month))
+    return gaps, json_etag(gaps)
+
+def conditional_json(etag, build):
+    """Answer 304 when the client already holds etag, else build() as JSON."""
+    if etag in request.if_none_match:
+        response = app.response_class(status=304)
+    else:
+        response = jsonify(build())
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+@app.route('/dashboards/monthly_units')
+def dashboard_monthly_units():
+    if g.user is None:
+        return redirect('/login')
+    return conditional_json(f"{dashboard_aggregates['version']}-monthly",
+                            lambda: dashboard_aggregates['monthly_by_category'])
+
+@app.route('/dashboards/top_products')
+def dashboard_top_products():
+    if g.user is None:
+        return redirect('/login')
+    window = 'recent' if request.args.get('window') == 'recent' else 'all'
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 100)
+    return conditional_json(f"{dashboard_aggregates['version']}-top-{window}-{limit}",
+                            lambda: dashboard_aggregates['top_products'][window][:limit])
+
+@app.route('/dashboards/stock_gaps')
+def dashboard_stock_gaps():
+    if g.user is None:
+        return redirect('/login')
+    next_month = datetime.today() + relativedelta(months=1)
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 1000)
+    key = f"gaps-{FORECAST_VERSION}-{next_month.year}-{next_month.month}"
+    gaps, etag = inventory_store.derived(key, lambda df: stock_gaps_with_etag(df, next_month.year, next_month.month))
+    return conditional_json(f"{etag}-{limit}", lambda: gaps[:limit])
+
+@app.route('/forecast_horizon')
+def forecast_horizon():
+    if g.user is None:
+        return redirect('/login')
+    months = min(max(request.args.get('months', 3, type=int), 1), MAX_FORECAST_MONTHS)
+    product_id = request.args.get('product_id')
+    forecast = horizon_forecast(model, monthly_units, months,
+                                product_ids=[product_id] if product_id else None)
+    plan = reorder_plan(forecast, inventory_store.snapshot())
+    series = {}
+    for pid, rows in plan.groupby('Product_ID', sort=False):
+        series[pid] = {
+            'Product_Name': rows['Product_Name'].iloc[0],
+            'Category': rows['Category'].iloc[0],
+            'Current_Stock': int(rows['Current_Stock'].iloc[0]),
+            'Forecast': [
+                {'Year': int(r.Year), 'Month': int(r.Month),
+                 'Predicted_Sales': int(round(r.Predicted_Sales)),
+                 'Required_Stock_to_Add': int(round(r.Required_Stock_to_Add))}
+                for r in rows.itertuples()
+            ],
+        }
+    return jsonify(series)
+
+def report_source(warehouse):
+    if not warehouse:
+        return inventory_store
+    if warehouse not in inventory_store.sites():
+        return None
+    return inventory_store.partition(warehouse)
+
+@app.route('/reports/valuation')
+def valuation_report():
+    if g.user is None:
+        return redirect('/login')
+    source = report_source(request.args.get('warehouse'))
+    if source is None:
+        return jsonify({"error": "Unknown warehouse"}), 404
+    return jsonify(source.derived('valuation', stock_valuation))
+
+@app.route('/reports/reorders')
+def reorder_report():
+    if g.user is None:
+        return redirect('/login')
+    source = report_source(request.args.get('warehouse'))
+    if source is None:
+        return jsonify({"error": "Unknown warehouse"}), 404
+    return jsonify(source.derived('reorders', supplier_reorders))
+
+@app.route('/reports/sites')
+def sites_report():
+    if g.user is None:
+        return redirect('/login')
+    summaries = inventory_store.summaries(site_summary)
+    return jsonify({"total": combine_site_summaries(summaries), "sites": summaries})
+
+@app.route('/scheduler_stats')
+def scheduler_stats():
+    if g.user is None:
+        return redirect('/login')
+    return jsonify(job_scheduler.stats())
 
 @app.route('/instructions')
 def instructions():
@@ -298,10 +609,26 @@ def main_page():
 def intro():
     return render_template('intro.html')
 
+# ==========================
+# App Factory
+# ==========================
+def create_app(with_scheduler=False):
+    """Return the app with model and data loaded.
+
+    Model, inventory and sales data are loaded when this module is imported.
+    A preforking server that imports it in its master process (gunicorn with
+    preload_app, see wsgi.py) therefore loads them once, and every worker
+    shares those pages copy-on-write. No threads or pools are started here;
+    the scheduler is started per process with start_scheduler().
+    """
+    if with_scheduler:
+        start_scheduler()
+    return app
+
 # ==========================
 # Run App
 # ==========================
 if __name__=="__main__":
-    threading.Thread(target=run_scheduler, daemon=True).start()
+    create_app(with_scheduler=True)
     app.run(host="0.0.0.0", port=5000, debug=True, use_reloader=False)
 
@@ -0,0 +1,58 @@
+import argparse
+import multiprocessing
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from forecast_engine import ForecastEngine
+from forecasting import build_lag_history
+
+# Measures forecast throughput of ForecastEngine from 1 to N worker processes.
+# The real catalog is tiled up to --products rows so the run is CPU-bound.
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default="Stock_prediction_model.pkl")
+    parser.add_argument("--sales", default="supermarket_sales.csv")
+    parser.add_argument("--products", type=int, default=100000)
+    parser.add_argument("--steps", type=int, default=6)
+    parser.add_argument("--max-workers", type=int, default=multiprocessing.cpu_count())
+    args = parser.parse_args()
+
+    sales_data = pd.read_csv(args.sales)
+    sales_data['Date'] = pd.to_datetime(sales_data['Date'])
+    sales_data['Product_ID'] = sales_data['Product_ID'].astype(str)
+    monthly_units = sales_data.groupby(
+        ['Product_ID', 'Product_Name', 'Category', pd.Grouper(key='Date', freq='ME')]
+    )['Units_Sold'].sum().reset_index()
+
+    products, history = build_lag_history(monthly_units)
+    reps = -(-args.products // len(products))
+    products = pd.concat([products] * reps, ignore_index=True).iloc[:args.products]
+    history = np.tile(history, (reps, 1))[:args.products]
+    model = joblib.load(args.model)
+
+    print(f"{len(products)} products x {args.steps} months, {multiprocessing.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'seconds':>9} {'rows/s':>10} {'speedup':>8}")
+    baseline, reference = None, None
+    for workers in range(1, args.max_workers + 1):
+        engine = ForecastEngine(args.model, workers=workers, model=model)
+        engine.rollout(products.iloc[:workers * 8], history[:workers * 8], 1)  # start the pool
+        start = time.perf_counter()
+        predictions = engine.rollout(products, history, args.steps)
+        elapsed = time.perf_counter() - start
+        engine.close()
+        if reference is None:
+            baseline, reference = elapsed, predictions
+        elif not np.allclose(predictions, reference):
+            raise SystemExit(f"Results with {workers} workers differ from the serial run")
+        rows = predictions.size
+        print(f"{workers:>8} {elapsed:>9.2f} {rows / elapsed:>10.0f} {baseline / elapsed:>8.2f}")
+
+
+# Pool workers re-import this module, so only run under __main__
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import argparse
+import glob
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# Builds fingerprinted copies of everything under static/ into static/dist/:
+#   images  -> name.<hash>.ext, plus a WebP re-encode when it is smaller
+#   css/js  -> name.<hash>.ext, plus a gzip-precompressed .gz copy
+# static/dist/manifest.json maps the original path to the built files and is
+# read by asset_url() in app.py. Re-encoding needs Pillow; without it images
+# are only fingerprinted.
+
+STATIC_DIR = "static"
+DIST_DIR = os.path.join(STATIC_DIR, "dist")
+TEMPLATE_DIR = "templates"
+IMAGE_EXTS = {".png", ".jpg", ".jpeg", ".gif"}
+TEXT_EXTS = {".css", ".js", ".svg"}
+
+
+def fingerprint(data):
+    return hashlib.sha256(data).hexdigest()[:12]
+
+def hashed_name(rel_path, data, ext=None):
+    root, orig_ext = os.path.splitext(rel_path)
+    return f"{root}.{fingerprint(data)}{ext or orig_ext}"
+
+def write(rel_path, data):
+    path = os.path.join(DIST_DIR, rel_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+def encode_webp(data):
+    img = Image.open(io.BytesIO(data))
+    out = io.BytesIO()
+    if getattr(img, "is_animated", False):
+        img.save(out, "WEBP", save_all=True, quality=75, method=4,
+                 duration=img.info.get("duration", 100), loop=img.info.get("loop", 0))
+    else:
+        img.save(out, "WEBP", quality=80, method=6)
+    return out.getvalue()
+
+def build():
+    if os.path.isdir(DIST_DIR):
+        shutil.rmtree(DIST_DIR)
+    manifest = {}
+    for path in sorted(glob.glob(os.path.join(STATIC_DIR, "**", "*"), recursive=True)):
+        if not os.path.isfile(path):
+            continue
+        rel_path = os.path.relpath(path, STATIC_DIR).replace(os.sep, "/")
+        ext = os.path.splitext(rel_path)[1].lower()
+        with open(path, "rb") as f:
+            data = f.read()
+
+        entry = {"file": hashed_name(rel_path, data), "size": len(data)}
+        write(entry["file"], data)
+        if ext in IMAGE_EXTS and Image is not None:
+            try:
+                webp = encode_webp(data)
+            except Exception as e:
+                print(f" WebP encode failed for {rel_path}: {e}")
+                webp = None
+            if webp and len(webp) < len(data):
+                # Same fingerprint as the original so one URL serves either variant
+                entry["webp"] = os.path.splitext(entry["file"])[0] + ".webp"
+                entry["webp_size"] = len(webp)
+                write(entry["webp"], webp)
+        elif ext in TEXT_EXTS:
+            gz = gzip.compress(data, compresslevel=9, mtime=0)
+            if len(gz) < len(data):
+                entry["gzip_size"] = len(gz)
+                write(entry["file"] + ".gz", gz)
+        manifest[rel_path] = entry
+
+    with open(os.path.join(DIST_DIR, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+def transfer_size(entry, optimized):
+    if not optimized:
+        return entry["size"]
+    return min(entry["size"], entry.get("webp_size", entry["size"]), entry.get("gzip_size", entry["size"]))
+
+def report(manifest):
+    """First-load and repeat-load bytes per template, before and after."""
+    pattern = re.compile(r"""(?:asset_url\(|filename=)\s*['"]([^'"]+)['"]""")
+    print(f"{'template':<24} {'first load':>12} {'optimized':>12} {'repeat load':>12} {'optimized':>12}")
+    for path in sorted(glob.glob(os.path.join(TEMPLATE_DIR, "*.html"))):
+        with open(path, encoding="utf-8") as f:
+            assets = [manifest[a] for a in pattern.findall(f.read()) if a in manifest]
+        if not assets:
+            continue
+        before = sum(transfer_size(a, False) for a in assets)
+        after = sum(transfer_size(a, True) for a in assets)
+        # Without far-future headers each asset is revalidated on every page
+        # load (a 304 round trip per asset); immutable assets are not requested.
+        print(f"{os.path.basename(path):<24} {before:>12,} {after:>12,} {f'{len(assets)} x 304':>12} {'0 requests':>12}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--report", action="store_true", help="print per-page transfer sizes")
+    args = parser.parse_args()
+    if Image is None:
+        print(" Pillow not installed, images will be fingerprinted but not re-encoded")
+    manifest = build()
+    original = sum(e["size"] for e in manifest.values())
+    optimized = sum(transfer_size(e, True) for e in manifest.values())
+    print(f" Built {len(manifest)} assets: {original:,} bytes -> {optimized:,} bytes")
+    if args.report:
+        report(manifest)
@@ -0,0 +1,56 @@
+import hashlib
+import json
+
+import pandas as pd
+
+
+RECENT_MONTHS = 3
+
+# ==========================
+# Sales Aggregates (built once at ingest)
+# ==========================
+def build_sales_aggregates(monthly):
+    """Aggregate monthly product sales once for the dashboard endpoints.
+
+    monthly is the per-product monthly frame (Product_ID, Product_Name,
+    Category, Date, Units_Sold) before lag rows are dropped.
+    """
+    by_category = monthly.groupby(['Category', 'Date'])['Units_Sold'].sum().reset_index()
+    by_category['Year'] = by_category['Date'].dt.year
+    by_category['Month'] = by_category['Date'].dt.month
+    by_category = by_category.sort_values(['Date', 'Category'])
+
+    def top(frame):
+        totals = frame.groupby(['Product_ID', 'Product_Name', 'Category'])['Units_Sold'].sum()
+        return totals.sort_values(ascending=False).reset_index().to_dict(orient='records')
+
+    recent_start = monthly['Date'].max() - pd.DateOffset(months=RECENT_MONTHS)
+    digest = hashlib.sha1(pd.util.hash_pandas_object(
+        monthly[['Product_ID', 'Date', 'Units_Sold']], index=False).values.tobytes())
+    return {
+        'version': digest.hexdigest()[:16],
+        'monthly_by_category': by_category[['Year', 'Month', 'Category', 'Units_Sold']].to_dict(orient='records'),
+        'top_products': {
+            'all': top(monthly),
+            'recent': top(monthly[monthly['Date'] > recent_start]),
+        },
+    }
+
+# ==========================
+# Stock vs Forecast
+# ==========================
+def stock_forecast_gaps(inventory_df, forecast):
+    """Products whose current stock is short of next month's forecast."""
+    stock = inventory_df[['Product_ID', 'Product_Name', 'Warehouse_Location', 'Stock_Quantity']]
+    stock = stock.assign(Stock_Quantity=pd.to_numeric(stock['Stock_Quantity'], errors='coerce').fillna(0))
+    gaps = stock.merge(forecast[['Product_ID', 'Predicted_Sales']], on='Product_ID', how='inner')
+    gaps['Gap'] = gaps['Predicted_Sales'] - gaps['Stock_Quantity']
+    gaps = gaps[gaps['Gap'] > 0].sort_values('Gap', ascending=False)
+    gaps['Predicted_Sales'] = gaps['Predicted_Sales'].round().astype(int)
+    gaps['Stock_Quantity'] = gaps['Stock_Quantity'].astype(int)
+    gaps['Gap'] = gaps['Gap'].round().astype(int)
+    return gaps.to_dict(orient='records')
+
+def json_etag(data):
+    """Content hash used as ETag for payloads that depend on live stock."""
+    return hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()[:16]
@@ -0,0 +1,41 @@
+import heapq
+import threading
+
+import pandas as pd
+
+
+# ==========================
+# Expiration Date Index
+# ==========================
+class ExpiryIndex:
+    """Min-heap of (expiration date, Product_ID) built once from inventory.
+
+    pop_expiring() removes only the entries expiring within the window, so a
+    check costs O(k log n) for k expiring products instead of a scan of the
+    whole catalog. Popped products are not reported again unless the caller
+    hands them back with push(), e.g. because they were out of stock.
+    """
+
+    def __init__(self, inventory_df, date_format="%m/%d/%Y"):
+        self._lock = threading.Lock()
+        dates = pd.to_datetime(inventory_df['Expiration_Date'], format=date_format, errors='coerce')
+        valid = dates.notna()
+        self._heap = list(zip(dates[valid].dt.date, inventory_df.loc[valid, 'Product_ID'].astype(str)))
+        heapq.heapify(self._heap)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def pop_expiring(self, until):
+        """Pop and return [(date, product_id)] for entries expiring on or before until."""
+        expiring = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= until:
+                expiring.append(heapq.heappop(self._heap))
+        return expiring
+
+    def push(self, entries):
+        """Put back (date, product_id) entries returned by pop_expiring()."""
+        with self._lock:
+            for entry in entries:
+                heapq.heappush(self._heap, entry)
@@ -0,0 +1,77 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import numpy as np
+
+from forecasting import build_lag_history, forecast_frame, rollout
+
+
+# Model used inside pool workers, loaded once per worker by _init_worker
+_worker_model = None
+
+def _init_worker(model_path):
+    global _worker_model
+    if _worker_model is None:
+        # A private copy per worker: sklearn trees copy their node arrays on
+        # unpickling, so even a memory-mapped load would not share pages
+        _worker_model = joblib.load(model_path)
+
+def _rollout_shard(shard):
+    products, history, steps = shard
+    return rollout(_worker_model, products, history, steps)
+
+# ==========================
+# Process-pool Forecast Engine
+# ==========================
+class ForecastEngine:
+    """Shards the product feature matrix across a pool of worker processes.
+
+    Each worker loads its own copy of the model, so memory grows with the
+    worker count. Every shard runs the same vectorized rollout as
+    forecasting.rollout; shard results are gathered in submission order, so
+    the output lines up with the input products.
+
+    Workers are started with forkserver (spawn where that is unavailable),
+    never by forking the caller: the app process runs scheduler and request
+    threads, and a forked child could inherit a lock held by one of them.
+    Call close() after a batch so idle workers do not keep their copies.
+    """
+
+    def __init__(self, model_path, workers=None, model=None, shards_per_worker=4):
+        self.model_path = model_path
+        self.workers = workers or multiprocessing.cpu_count()
+        self.model = model
+        self.shards_per_worker = shards_per_worker
+        self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            if 'forkserver' in multiprocessing.get_all_start_methods():
+                ctx = multiprocessing.get_context('forkserver')
+                ctx.set_forkserver_preload(['forecast_engine'])
+            else:
+                ctx = multiprocessing.get_context('spawn')
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=ctx,
+                                             initializer=_init_worker, initargs=(self.model_path,))
+        return self._pool
+
+    def rollout(self, products, history, steps):
+        if self.workers <= 1 or len(products) < self.workers:
+            if self.model is None:
+                self.model = joblib.load(self.model_path)
+            return rollout(self.model, products, history, steps)
+        n_shards = min(len(products), self.workers * self.shards_per_worker)
+        bounds = np.linspace(0, len(products), n_shards + 1, dtype=int)
+        shards = [(products.iloc[a:b], history[a:b], steps) for a, b in zip(bounds[:-1], bounds[1:])]
+        results = list(self._get_pool().map(_rollout_shard, shards))
+        return np.vstack(results)
+
+    def horizon_forecast(self, monthly_units, steps, product_ids=None):
+        products, history = build_lag_history(monthly_units, product_ids)
+        return forecast_frame(products, self.rollout(products, history, max(steps, 0)))
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
@@ -0,0 +1,100 @@
+import hashlib
+import os
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+
+
+
+# ==========================
+# Materialized Forecast Table
+# ==========================
+def init_forecast_table(db_path):
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute("""CREATE TABLE IF NOT EXISTS forecasts (
+                      model_version TEXT,
+                      product_id TEXT,
+                      year INTEGER,
+                      month INTEGER,
+                      product_name TEXT,
+                      category TEXT,
+                      predicted_sales REAL,
+                      PRIMARY KEY (model_version, product_id, year, month)
+                      )""")
+    cursor.execute("""CREATE INDEX IF NOT EXISTS idx_forecasts_month
+                      ON forecasts (model_version, year, month)""")
+    cursor.execute("""CREATE TABLE IF NOT EXISTS forecast_meta (
+                      id INTEGER PRIMARY KEY CHECK (id = 1),
+                      model_version TEXT,
+                      created_at TEXT,
+                      row_count INTEGER
+                      )""")
+    conn.commit()
+    conn.close()
+
+def model_version(model_path, monthly_units):
+    """Fingerprint of the model file and the sales history it forecasts from."""
+    stat = os.stat(model_path)
+    digest = hashlib.sha1(f"{os.path.abspath(model_path)}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    digest.update(pd.util.hash_pandas_object(monthly_units[['Product_ID', 'Date', 'Units_Sold']],
+                                             index=False).values.tobytes())
+    return digest.hexdigest()[:16]
+
+def current_version(db_path):
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute("SELECT model_version FROM forecast_meta WHERE id=1")
+    row = cursor.fetchone()
+    conn.close()
+    return row[0] if row else None
+
+def materialize_forecasts(db_path, forecast, version):
+    """Publish a horizon_forecast frame as the given version.
+
+    Rows for the new version are written and the meta row switched in one
+    transaction, so lookups see either the old table or the new one.
+    """
+    rows = zip(
+        [version] * len(forecast),
+        forecast['Product_ID'].astype(str),
+        forecast['Year'].astype(int).tolist(),
+        forecast['Month'].astype(int).tolist(),
+        forecast['Product_Name'],
+        forecast['Category'],
+        forecast['Predicted_Sales'].astype(float).tolist(),
+    )
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM forecasts WHERE model_version=?", (version,))
+    cursor.executemany("INSERT INTO forecasts VALUES (?,?,?,?,?,?,?)", rows)
+    cursor.execute("INSERT OR REPLACE INTO forecast_meta (id, model_version, created_at, row_count) VALUES (1,?,?,?)",
+                   (version, datetime.now().isoformat(timespec="seconds"), len(forecast)))
+    cursor.execute("DELETE FROM forecasts WHERE model_version<>?", (version,))
+    conn.commit()
+    conn.close()
+    return len(forecast)
+
+def lookup_forecast(db_path, version, product_id, year, month):
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute("""SELECT product_name, category, predicted_sales FROM forecasts
+                      WHERE model_version=? AND product_id=? AND year=? AND month=?""",
+                   (version, str(product_id), int(year), int(month)))
+    row = cursor.fetchone()
+    conn.close()
+    if row is None:
+        return None
+    return {"Product_Name": row[0], "Category": row[1], "Predicted_Sales": row[2]}
+
+def lookup_month(db_path, version, year, month):
+    conn = sqlite3.connect(db_path)
+    forecast = pd.read_sql_query(
+        """SELECT product_id AS Product_ID, product_name AS Product_Name,
+                  category AS Category, predicted_sales AS Predicted_Sales
+           FROM forecasts
+           WHERE model_version=? AND year=? AND month=?""",
+        conn, params=(version, int(year), int(month)))
+    conn.close()
+    return forecast
@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+
+FEATURE_COLUMNS = ['Lag_1', 'Lag_2', 'Lag_3', 'Lag_6', 'Year', 'Month']
+HISTORY_DEPTH = 6
+
+# ==========================
+# Lag History
+# ==========================
+def build_lag_history(monthly_units, product_ids=None):
+    """Return (products, history) for the recursive forecast.
+
+    monthly_units is the per-product monthly Units_Sold frame before lag rows
+    are dropped. products is one row per Product_ID with its name, category
+    and the period index (year * 12 + month - 1) of its latest month of
+    sales. history is an (n_products, 6) array of the last six monthly units,
+    oldest first. Products with fewer than six months of sales have no full
+    lag row (the model was never trained on them) and are left out.
+    """
+    monthly = monthly_units
+    if product_ids is not None:
+        monthly = monthly[monthly['Product_ID'].isin([str(p) for p in product_ids])]
+    monthly = monthly.sort_values(['Product_ID', 'Date'])
+    counts = monthly.groupby('Product_ID', sort=True)['Units_Sold'].transform('size')
+    tail = monthly[counts >= HISTORY_DEPTH].groupby('Product_ID', sort=True).tail(HISTORY_DEPTH)
+
+    last = tail.groupby('Product_ID', sort=True).tail(1).reset_index(drop=True)
+    products = last[['Product_ID', 'Product_Name', 'Category']].copy()
+    products['Period'] = (last['Date'].dt.year * 12 + last['Date'].dt.month - 1).to_numpy()
+
+    # tail is sorted by product then date, so each block of six is [t-5 .. t]
+    history = tail['Units_Sold'].to_numpy(dtype=float).reshape(len(products), HISTORY_DEPTH)
+    return products, history
+
+# ==========================
+# Horizon Forecast
+# ==========================
+def rollout(model, products, history, steps):
+    """Roll lags forward `steps` months, one model.predict per step.
+
+    Each step predicts every product at once, then shifts the prediction into
+    the history so the next step's Lag_1..Lag_6 are built from it. Returns an
+    (n_products, steps) array of predicted units.
+    """
+    history = history.copy()
+    period = products['Period'].to_numpy()
+    predictions = np.empty((len(products), steps))
+    if len(products) == 0:
+        return predictions
+    for step in range(steps):
+        target = period + step + 1
+        X = pd.DataFrame({
+            'Lag_1': history[:, -1],
+            'Lag_2': history[:, -2],
+            'Lag_3': history[:, -3],
+            'Lag_6': history[:, -6],
+            'Year': target // 12,
+            'Month': target % 12 + 1,
+        }, columns=FEATURE_COLUMNS)
+        predictions[:, step] = model.predict(X)
+        history = np.column_stack([history[:, 1:], predictions[:, step]])
+    return predictions
+
+def forecast_frame(products, predictions):
+    """Turn rollout output into one row per product and forecast month."""
+    n, steps = predictions.shape
+    step = np.tile(np.arange(1, steps + 1), n)
+    target = np.repeat(products['Period'].to_numpy(), steps) + step
+    return pd.DataFrame({
+        'Product_ID': np.repeat(products['Product_ID'].to_numpy(), steps),
+        'Product_Name': np.repeat(products['Product_Name'].to_numpy(), steps),
+        'Category': np.repeat(products['Category'].to_numpy(), steps),
+        'Step': step,
+        'Year': target // 12,
+        'Month': target % 12 + 1,
+        'Predicted_Sales': predictions.ravel(),
+    })
+
+def horizon_forecast(model, monthly_units, steps, product_ids=None):
+    """Forecast the next `steps` months for every product (or product_ids).
+
+    Returns a long DataFrame with one row per product and month:
+    Product_ID, Product_Name, Category, Step, Year, Month, Predicted_Sales.
+    """
+    products, history = build_lag_history(monthly_units, product_ids)
+    steps = max(steps, 0)
+    return forecast_frame(products, rollout(model, products, history, steps))
+
+def reorder_plan(forecast, inventory_df):
+    """Add current stock and cumulative stock to add for each forecast month."""
+    stock = inventory_df[['Product_ID', 'Stock_Quantity']].drop_duplicates('Product_ID')
+    stock = stock.assign(Stock_Quantity=pd.to_numeric(stock['Stock_Quantity'], errors='coerce').fillna(0))
+    plan = forecast.merge(stock, on='Product_ID', how='left')
+    plan['Current_Stock'] = plan.pop('Stock_Quantity').fillna(0)
+    plan['Cumulative_Sales'] = plan.groupby('Product_ID')['Predicted_Sales'].cumsum()
+    plan['Required_Stock_to_Add'] = (plan['Cumulative_Sales'] - plan['Current_Stock']).clip(lower=0)
+    return plan
@@ -0,0 +1,22 @@
+import gc
+import multiprocessing
+import os
+
+# Load model and data once in the master, then fork workers that share them
+preload_app = True
+bind = os.environ.get("BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+threads = int(os.environ.get("WEB_THREADS", "4"))
+timeout = 120
+
+
+def when_ready(server):
+    # Keep the preloaded objects out of the collector so workers do not
+    # copy their pages just by running a GC pass
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # Every worker tries; one runs it and the others wait to take over
+    from app import start_scheduler
+    start_scheduler()
@@ -0,0 +1,101 @@
+import pandas as pd
+
+
+def _numeric(series):
+    return pd.to_numeric(series, errors='coerce').fillna(0)
+
+# ==========================
+# Stock Valuation
+# ==========================
+def stock_valuation(inventory_df):
+    """Stock value (quantity x unit price) in total and per category,
+    warehouse and supplier, computed with vectorized groupbys."""
+    df = inventory_df.assign(
+        Stock_Quantity=_numeric(inventory_df['Stock_Quantity']).clip(lower=0),
+    )
+    df['Stock_Value'] = df['Stock_Quantity'] * df['Unit_Price_Value']
+
+    def rollup(key):
+        grouped = df.groupby(key, sort=False).agg(
+            Products=('Product_ID', 'size'),
+            Units=('Stock_Quantity', 'sum'),
+            Stock_Value=('Stock_Value', 'sum'),
+        ).sort_values('Stock_Value', ascending=False).reset_index()
+        grouped['Stock_Value'] = grouped['Stock_Value'].round(2)
+        return grouped.to_dict(orient='records')
+
+    return {
+        'total': {
+            'Products': int(len(df)),
+            'Units': int(df['Stock_Quantity'].sum()),
+            'Stock_Value': round(float(df['Stock_Value'].sum()), 2),
+        },
+        'by_category': rollup('Category'),
+        'by_warehouse': rollup('Warehouse_Location'),
+        'by_supplier': rollup(['Supplier_ID', 'Supplier_Name']),
+    }
+
+# ==========================
+# Supplier Reorder Lists
+# ==========================
+def supplier_reorders(inventory_df):
+    """Products at or below their Reorder_Level, grouped by supplier and
+    warehouse, with the quantity and cost to reorder."""
+    df = inventory_df.assign(
+        Stock_Quantity=_numeric(inventory_df['Stock_Quantity']),
+        Reorder_Level=_numeric(inventory_df['Reorder_Level']),
+        Reorder_Quantity=_numeric(inventory_df['Reorder_Quantity']),
+    )
+    df = df[df['Stock_Quantity'] <= df['Reorder_Level']]
+    if 'Status' in df.columns:
+        df = df[df['Status'] != 'Discontinued']
+    df = df.assign(Reorder_Cost=df['Reorder_Quantity'] * df['Unit_Price_Value'])
+
+    keys = ['Supplier_ID', 'Supplier_Name', 'Warehouse_Location']
+    totals = df.groupby(keys, sort=False).agg(
+        Products=('Product_ID', 'size'),
+        Reorder_Units=('Reorder_Quantity', 'sum'),
+        Reorder_Cost=('Reorder_Cost', 'sum'),
+    )
+    items = df[keys + ['Product_ID', 'Product_Name', 'Stock_Quantity', 'Reorder_Level', 'Reorder_Quantity']]
+
+    orders = []
+    for key, group in items.groupby(keys, sort=False):
+        total = totals.loc[key]
+        orders.append({
+            'Supplier_ID': key[0],
+            'Supplier_Name': key[1],
+            'Warehouse_Location': key[2],
+            'Products': int(total['Products']),
+            'Reorder_Units': int(total['Reorder_Units']),
+            'Reorder_Cost': round(float(total['Reorder_Cost']), 2),
+            'Items': group.drop(columns=keys).astype({'Stock_Quantity': int, 'Reorder_Level': int,
+                                                      'Reorder_Quantity': int}).to_dict(orient='records'),
+        })
+    orders.sort(key=lambda o: o['Reorder_Cost'], reverse=True)
+    return orders
+
+# ==========================
+# Per-site Summaries
+# ==========================
+def site_summary(inventory_df):
+    """Small additive summary of one warehouse partition."""
+    qty = _numeric(inventory_df['Stock_Quantity'])
+    reorder_level = _numeric(inventory_df['Reorder_Level'])
+    return {
+        'Products': int(len(inventory_df)),
+        'Units': int(qty.clip(lower=0).sum()),
+        'Stock_Value': float((qty.clip(lower=0) * inventory_df['Unit_Price_Value']).sum()),
+        'Out_Of_Stock': int((qty <= 0).sum()),
+        'Below_Reorder_Level': int((qty <= reorder_level).sum()),
+    }
+
+def combine_site_summaries(summaries):
+    """Cross-site totals from per-site summaries, without touching the rows."""
+    total = {'Sites': len(summaries), 'Products': 0, 'Units': 0, 'Stock_Value': 0.0,
+             'Out_Of_Stock': 0, 'Below_Reorder_Level': 0}
+    for summary in summaries.values():
+        for key, value in summary.items():
+            total[key] += value
+    total['Stock_Value'] = round(total['Stock_Value'], 2)
+    return total
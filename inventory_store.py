@@ -0,0 +1,217 @@
+import math
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process development server only
+    fcntl = None
+
+
+def safe_qty(val):
+    try:
+        if val is None or (isinstance(val, float) and math.isnan(val)):
+            return 0
+        return int(val)
+    except:
+        return 0
+
+def apply_stock_change(df, product_id, change):
+    idx = df[df['Product_ID'].astype(str) == product_id].index
+    if idx.empty:
+        return None
+    df.loc[idx, 'Stock_Quantity'] = df.loc[idx, 'Stock_Quantity'].apply(safe_qty) + change
+    return df
+
+def parse_numeric_columns(df):
+    """Add numeric columns parsed once at load (e.g. "$4.50 " -> 4.5)."""
+    if 'Unit_Price' in df.columns:
+        df['Unit_Price_Value'] = pd.to_numeric(
+            df['Unit_Price'].astype(str).str.replace(r'[$,\s]', '', regex=True), errors='coerce'
+        ).fillna(0.0)
+    return df
+
+def read_inventory_csv(path):
+    """Read an inventory CSV; returns (df with numeric columns, original columns)."""
+    df = pd.read_csv(path)
+    columns = list(df.columns)
+    if 'Product_ID' in df.columns:
+        df['Product_ID'] = df['Product_ID'].astype(str)
+    return parse_numeric_columns(df), columns
+
+# ==========================
+# Cross-process Generation Counters
+# ==========================
+class GenerationCounter:
+    """Per-file write counters shared by worker processes through SQLite.
+
+    A writer bumps the file's counter while it still holds the file's flock,
+    so a counter that differs from the one a process last saw means the file
+    was rewritten since. Unlike mtimes, counters never collide when two
+    writes land within the filesystem's timestamp granularity.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        conn = sqlite3.connect(db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""CREATE TABLE IF NOT EXISTS generations (
+                        name TEXT PRIMARY KEY,
+                        gen INTEGER NOT NULL
+                        )""")
+        conn.commit()
+        conn.close()
+
+    def bump(self, name):
+        """Increment name's counter and return the new value."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        # Counters only signal "reload"; WAL needs no fsync per commit for that
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with conn:
+            conn.execute("""INSERT INTO generations (name, gen) VALUES (?, 1)
+                            ON CONFLICT(name) DO UPDATE SET gen = gen + 1""", (name,))
+            gen = conn.execute("SELECT gen FROM generations WHERE name=?", (name,)).fetchone()[0]
+        conn.close()
+        return gen
+
+    def get(self, name):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        row = conn.execute("SELECT gen FROM generations WHERE name=?", (name,)).fetchone()
+        conn.close()
+        return row[0] if row else 0
+
+    def all(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        rows = conn.execute("SELECT name, gen FROM generations").fetchall()
+        conn.close()
+        return dict(rows)
+
+    def total(self):
+        """Sum of all counters; changes whenever any file is rewritten."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        total = conn.execute("SELECT COALESCE(SUM(gen), 0) FROM generations").fetchone()[0]
+        conn.close()
+        return total
+
+# ==========================
+# Copy-on-write Inventory Store
+# ==========================
+class InventoryStore:
+    """Holds the current inventory DataFrame as an immutable snapshot.
+
+    Readers call snapshot() and get the published DataFrame without taking a
+    lock; they must treat it as read-only. Writers go through update(), which
+    is serialized, works on a private copy and publishes the copy in a single
+    reference assignment, so a reader never sees a half-applied change.
+    Results derived from a snapshot can be memoized with derived(); they are
+    dropped whenever a new snapshot is published.
+
+    When several worker processes share the backing file, update() also
+    holds an flock on it, first reloads changes written by other processes
+    and bumps the file's generation counter after writing;
+    reload_if_changed() lets readers pick those changes up. Counters live in
+    generations.db next to the file unless a shared GenerationCounter is
+    passed in.
+    """
+
+    def __init__(self, df, path=None, columns=None, generations=None):
+        self._lock = threading.Lock()
+        self._path = path
+        self._columns = list(columns) if columns is not None else list(df.columns)
+        self._version = 0
+        self._snapshot = df
+        self._derived = {}
+        if path and generations is None:
+            generations = GenerationCounter(os.path.join(os.path.dirname(path) or '.', 'generations.db'))
+        self._generations = generations if path else None
+        self._name = os.path.basename(path) if path else None
+        self._generation = generations.get(self._name) if path else None
+
+    @classmethod
+    def from_csv(cls, path):
+        df, columns = read_inventory_csv(path)
+        return cls(df, path=path, columns=columns)
+
+    @property
+    def version(self):
+        return self._version
+
+    def snapshot(self):
+        return self._snapshot
+
+    def update(self, mutate):
+        """Apply mutate(df_copy) and publish the result.
+
+        mutate receives a private copy and returns the new DataFrame, or None
+        to leave the published snapshot untouched. Returns the new snapshot
+        (or None when nothing changed).
+        """
+        with self._lock, self._file_lock(fcntl.LOCK_EX if fcntl else None):
+            if self._path:
+                generation = self._generations.get(self._name)
+                if generation != self._generation:
+                    self._publish(read_inventory_csv(self._path)[0])
+                    self._generation = generation
+            new_df = mutate(self._snapshot.copy())
+            if new_df is None:
+                return None
+            if self._path:
+                new_df[self._columns].to_csv(self._path, index=False)
+                self._generation = self._generations.bump(self._name)
+            self._publish(new_df)
+            return new_df
+
+    def reload_if_changed(self, generations=None):
+        """Reload the backing file if another process rewrote it.
+
+        generations is an optional {name: counter} dict read once by the
+        caller, so checking many stores costs a single query.
+        """
+        if not self._path:
+            return False
+        if generations is not None:
+            generation = generations.get(self._name, 0)
+        else:
+            generation = self._generations.get(self._name)
+        if generation == self._generation:
+            return False
+        with self._lock, self._file_lock(fcntl.LOCK_SH if fcntl else None):
+            # Writers bump while holding LOCK_EX, so file and counter agree here
+            generation = self._generations.get(self._name)
+            if generation == self._generation:
+                return False
+            self._publish(read_inventory_csv(self._path)[0])
+            self._generation = generation
+            return True
+
+    def _publish(self, df):
+        self._snapshot = df
+        self._version += 1
+        self._derived = {}
+
+    @contextmanager
+    def _file_lock(self, mode):
+        if mode is None or not self._path or not os.path.exists(self._path):
+            yield
+            return
+        with open(self._path, 'a') as f:
+            fcntl.flock(f, mode)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def derived(self, name, compute):
+        """Return compute(snapshot), cached until the next update()."""
+        snapshot, cache = self._snapshot, self._derived
+        entry = cache.get(name)
+        if entry is not None and entry[0] is snapshot:
+            return entry[1]
+        result = compute(snapshot)
+        if self._snapshot is snapshot:
+            cache[name] = (snapshot, result)
+        return result
@@ -0,0 +1,213 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import schedule
+
+try:
+    import fcntl
+except ImportError:  # Windows: development server only
+    fcntl = None
+
+
+def acquire_or_wait(lock_path, on_acquired):
+    """Call on_acquired() in the one process that holds an flock on lock_path.
+
+    Returns the open lock file, which must stay open for the life of the
+    process. If another process holds the lock, a daemon thread blocks on it
+    and calls on_acquired() once that process exits. This matters on a
+    gunicorn reload (HUP), which starts the new workers before it stops the
+    old ones, so no new worker can take the lock on its first try.
+    """
+    lock_file = open(lock_path, 'a')
+    if fcntl is None:
+        on_acquired()
+        return lock_file
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        def wait():
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            on_acquired()
+        threading.Thread(target=wait, daemon=True, name="lock-wait").start()
+        return lock_file
+    on_acquired()
+    return lock_file
+
+# ==========================
+# Non-blocking Job Scheduler
+# ==========================
+class JobScheduler:
+    """Runs `schedule` jobs on per-job executors instead of the loop thread.
+
+    Each registered job gets its own single-thread executor, so a slow
+    monthly report never delays the low stock check. If a job is still
+    running when it comes due again the new run is either skipped
+    (overlap="skip") or coalesced into a single follow-up run
+    (overlap="coalesce"). Lateness is measured from the time the run was
+    scheduled for (schedule's Job.next_run), not from when the loop got to
+    it; a skipped run counts as late until the run blocking it finishes.
+    Lateness and duration are recorded per job and available through stats().
+
+    Only one process runs the scheduler, so with stats_db the stats are also
+    written to SQLite after every change and stats() reads them from there;
+    any worker process then reports the same numbers.
+    """
+
+    def __init__(self, stats_db=None):
+        self._scheduler = schedule.Scheduler()
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._due = None
+        self._stats_db = stats_db
+        if stats_db:
+            conn = sqlite3.connect(stats_db, timeout=30)
+            cursor = conn.cursor()
+            cursor.execute("""CREATE TABLE IF NOT EXISTS job_stats (
+                              name TEXT PRIMARY KEY,
+                              pid INTEGER,
+                              data TEXT,
+                              updated_at TEXT
+                              )""")
+            conn.commit()
+            conn.close()
+
+    def add_job(self, name, func, overlap="skip"):
+        """Register func under name; returns a dispatcher for schedule.do()."""
+        if overlap not in ("skip", "coalesce"):
+            raise ValueError(f"Unknown overlap policy: {overlap}")
+        self._jobs[name] = {
+            "func": func,
+            "overlap": overlap,
+            "executor": ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"job-{name}"),
+            "running": False,
+            "pending": None,
+            "runs": 0,
+            "skipped": 0,
+            "coalesced": 0,
+            "failures": 0,
+            "last_started": None,
+            "last_lateness": None,
+            "last_skipped_lateness": None,
+            "max_lateness": 0.0,
+            "skipped_since": None,
+            "last_duration": None,
+            "max_duration": 0.0,
+        }
+        self._save_stats(name)
+        return lambda: self.dispatch(name, self._due)
+
+    def every(self, interval=1):
+        return self._scheduler.every(interval)
+
+    def dispatch(self, name, due=None):
+        """Start job name now; due is when the run was scheduled for."""
+        job = self._jobs[name]
+        due = due or datetime.now()
+        with self._lock:
+            busy = job["running"]
+            if busy:
+                if job["overlap"] == "coalesce":
+                    if job["pending"] is None:
+                        job["pending"] = due
+                    else:
+                        job["coalesced"] += 1
+                else:
+                    job["skipped"] += 1
+                    if job["skipped_since"] is None:
+                        job["skipped_since"] = due
+                    print(f" Job {name} still running, skipping this run")
+            else:
+                job["running"] = True
+        if busy:
+            self._save_stats(name)
+            return
+        job["executor"].submit(self._run, name, due)
+
+    def _run(self, name, due):
+        job = self._jobs[name]
+        while True:
+            started_at = datetime.now()
+            started = time.monotonic()
+            failed = False
+            try:
+                job["func"]()
+            except Exception as e:
+                failed = True
+                print(f" Job {name} failed: {e}")
+            duration = time.monotonic() - started
+            lateness = (started_at - due).total_seconds()
+            with self._lock:
+                job["runs"] += 1
+                if failed:
+                    job["failures"] += 1
+                job["last_started"] = started_at.isoformat(timespec="seconds")
+                job["last_lateness"] = lateness
+                job["max_lateness"] = max(job["max_lateness"], lateness)
+                job["last_duration"] = duration
+                job["max_duration"] = max(job["max_duration"], duration)
+                if job["skipped_since"] is not None:
+                    # The earliest skipped run could only have started now
+                    skipped_lateness = (datetime.now() - job["skipped_since"]).total_seconds()
+                    job["last_skipped_lateness"] = skipped_lateness
+                    job["max_lateness"] = max(job["max_lateness"], skipped_lateness)
+                    job["skipped_since"] = None
+                done = job["pending"] is None
+                if done:
+                    job["running"] = False
+                else:
+                    due, job["pending"] = job["pending"], None
+            self._save_stats(name)
+            if done:
+                return
+
+    def _public_stats(self, job):
+        return {k: v for k, v in job.items() if k not in ("func", "executor", "pending", "skipped_since")}
+
+    def _save_stats(self, name):
+        if not self._stats_db:
+            return
+        with self._lock:
+            data = json.dumps(self._public_stats(self._jobs[name]))
+        conn = sqlite3.connect(self._stats_db, timeout=30)
+        cursor = conn.cursor()
+        cursor.execute("INSERT OR REPLACE INTO job_stats (name, pid, data, updated_at) VALUES (?,?,?,?)",
+                       (name, os.getpid(), data, datetime.now().isoformat(timespec="seconds")))
+        conn.commit()
+        conn.close()
+
+    def stats(self):
+        """Per-job stats, from stats_db when set, else from this process."""
+        if self._stats_db:
+            conn = sqlite3.connect(self._stats_db, timeout=30)
+            cursor = conn.cursor()
+            cursor.execute("SELECT name, pid, data, updated_at FROM job_stats ORDER BY name")
+            rows = cursor.fetchall()
+            conn.close()
+            return {name: {**json.loads(data), "pid": pid, "updated_at": updated_at}
+                    for name, pid, data, updated_at in rows}
+        with self._lock:
+            return {name: self._public_stats(job) for name, job in self._jobs.items()}
+
+    def run_pending(self):
+        """Like schedule's run_pending, but passes each job's due time along."""
+        for job in sorted(j for j in self._scheduler.jobs if j.should_run):
+            self._due = job.next_run
+            try:
+                if job.run() is schedule.CancelJob:
+                    self._scheduler.cancel_job(job)
+            finally:
+                self._due = None
+
+    def run_forever(self, tick=1):
+        while True:
+            self.run_pending()
+            time.sleep(tick)
+
+    def shutdown(self, wait=True):
+        for job in self._jobs.values():
+            job["executor"].shutdown(wait=wait)
@@ -0,0 +1,92 @@
+import argparse
+import http.cookiejar
+import os
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import pandas as pd
+
+# Starts gunicorn (gunicorn.conf.py, wsgi:app) with each requested worker
+# count, logs in a load-test user and reports requests/second and latency
+# for POST /manual_prediction.
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+parser.add_argument("--requests", type=int, default=2000)
+parser.add_argument("--concurrency", type=int, default=16)
+parser.add_argument("--port", type=int, default=5055)
+args = parser.parse_args()
+
+base = f"http://127.0.0.1:{args.port}"
+product_ids = pd.read_csv("inventory_data.csv")['Product_ID'].astype(str).tolist()
+
+
+def opener():
+    return urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+
+def post(client, path, data):
+    return client.open(base + path, urllib.parse.urlencode(data).encode(), timeout=30)
+
+def wait_until_up(proc):
+    for _ in range(600):
+        if proc.poll() is not None:
+            sys.exit("gunicorn exited during startup")
+        try:
+            urllib.request.urlopen(base + "/intro", timeout=1)
+            return
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.5)
+    sys.exit("gunicorn did not start")
+
+def login():
+    client = opener()
+    user = {"username": "loadtest", "email": "loadtest@example.com",
+            "gmail_password": "-", "password": "loadtest"}
+    post(client, "/signup", user).read()  # "Email already exists" after the first run
+    post(client, "/login", {"username": user["username"], "password": user["password"]}).read()
+    return client
+
+def run(client, count, latencies, errors):
+    for _ in range(count):
+        form = {"product_id": random.choice(product_ids), "year": random.choice([2025, 2026]),
+                "month": random.randint(1, 12)}
+        start = time.perf_counter()
+        try:
+            post(client, "/manual_prediction", form).read()
+            latencies.append(time.perf_counter() - start)
+        except Exception:
+            errors.append(1)
+
+
+print(f"{'workers':>8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+for workers in args.workers:
+    env = dict(os.environ, WEB_CONCURRENCY=str(workers), BIND=f"127.0.0.1:{args.port}",
+               LOW_STOCK_CHECK_SECONDS="86400")
+    proc = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:app"],
+                            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_up(proc)
+        client = login()
+        run(client, 50, [], [])  # warm up every worker
+        latencies, errors = [], []
+        per_thread = args.requests // args.concurrency
+        threads = [threading.Thread(target=run, args=(client, per_thread, latencies, errors))
+                   for _ in range(args.concurrency)]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+        q = statistics.quantiles(latencies, n=20)
+        print(f"{workers:>8} {len(latencies) / elapsed:>8.1f} {q[9] * 1000:>8.1f} {q[18] * 1000:>8.1f} {len(errors):>7}")
+    finally:
+        proc.terminate()
+        proc.wait()
@@ -0,0 +1,242 @@
+import glob
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from inventory_store import InventoryStore, GenerationCounter, parse_numeric_columns
+
+
+def partition_filename(name):
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', str(name)).strip('_').lower() or 'site'
+    return f"{slug[:40]}-{hashlib.sha1(str(name).encode()).hexdigest()[:6]}.csv"
+
+def load_site_map(path):
+    """Read a JSON object mapping partition key values to site names."""
+    if not path:
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def read_layout(directory):
+    try:
+        with open(os.path.join(directory, '.layout')) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def write_layout(directory, layout):
+    with open(os.path.join(directory, '.layout'), 'w') as f:
+        json.dump(layout, f)
+
+def _map_batch(fn, items):
+    return {site: fn(site, snapshot) for site, snapshot in items}
+
+# ==========================
+# Inventory Partitioned by Warehouse
+# ==========================
+class PartitionedInventory:
+    """One InventoryStore per site.
+
+    Rows are assigned to sites by the key column (Warehouse_Location by
+    default); site_map optionally maps key values to site names, so several
+    locations can share one site. Each site has its own lock, copy-on-write
+    snapshot and CSV file, so an adjustment only copies and rewrites that
+    site's rows and writers at different sites never wait on each other.
+
+    Small sites are grouped into batches of roughly equal row counts. The
+    whole-catalog snapshot() is stitched together from per-batch frames, and
+    after a change only the batch holding the changed site is rebuilt;
+    derived() memoizes on it the same way InventoryStore does.
+    map_partitions() hands the thread pool one task per batch, and
+    map_batches() runs a vectorized scan once per batch frame.
+
+    Every write bumps the site's counter in the directory's generations.db.
+    Other worker processes notice the counters' total change (checked at
+    most every sync_interval seconds) and reload only the site files whose
+    counters moved.
+    """
+
+    def __init__(self, df, directory=None, key='Warehouse_Location', site_map=None, columns=None,
+                 workers=4, sync_interval=1.0, batches_per_worker=4):
+        self._key = key
+        self._site_map = site_map or {}
+        self._columns = list(columns) if columns is not None else list(df.columns)
+        self._directory = directory
+        self._partitions = {}
+        self._product_site = {}
+        self._lock = threading.Lock()
+        self._version = 0
+        self._combined = None
+        self._batch_frames = {}
+        self._derived = {}
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="partition")
+        self._generations = None
+        self._sync_interval = sync_interval
+        self._checked_at = 0.0
+        layout = {'key': key, 'site_map': self._site_map}
+        rewrite = False
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._generations = GenerationCounter(os.path.join(directory, 'generations.db'))
+            # Files written under another key or site map hold the wrong rows
+            rewrite = read_layout(directory) != layout
+
+        sites = df[key].map(lambda value: self._site_map.get(str(value), value)) if self._site_map else df[key]
+        files = set()
+        for name, rows in df.groupby(sites, sort=False, dropna=False):
+            path = os.path.join(directory, partition_filename(name)) if directory else None
+            if path and (rewrite or not os.path.exists(path)):
+                rows[self._columns].to_csv(path, index=False)
+            files.add(path)
+            store = InventoryStore(rows.reset_index(drop=True), path=path, columns=self._columns,
+                                   generations=self._generations)
+            self._partitions[name] = store
+            for pid in rows['Product_ID']:
+                self._product_site[pid] = name
+        if rewrite:
+            for path in glob.glob(os.path.join(directory, '*.csv')):
+                if path not in files:
+                    os.remove(path)
+            write_layout(directory, layout)
+
+        total_rows = sum(len(store.snapshot()) for store in self._partitions.values())
+        self._batch_rows = max(math.ceil(total_rows / (workers * batches_per_worker)), 1)
+        self._batches = self._batch(self._partitions)
+        self._generation = self._generations.total() if self._generations else None
+
+    @classmethod
+    def load(cls, seed_csv, directory, key='Warehouse_Location', site_map=None, workers=4):
+        """Load site files from directory, seeding them from seed_csv on first run."""
+        files = sorted(glob.glob(os.path.join(directory, '*.csv')))
+        if files:
+            df = pd.concat([pd.read_csv(f) for f in files], ignore_index=True)
+        else:
+            df = pd.read_csv(seed_csv)
+        columns = list(df.columns)
+        df['Product_ID'] = df['Product_ID'].astype(str)
+        return cls(parse_numeric_columns(df), directory=directory, key=key, site_map=site_map,
+                   columns=columns, workers=workers)
+
+    @property
+    def version(self):
+        return self._version
+
+    def sites(self):
+        return list(self._partitions)
+
+    def partition(self, site):
+        self.sync()
+        return self._partitions[site]
+
+    def site_of(self, product_id):
+        return self._product_site.get(str(product_id))
+
+    def update_product(self, product_id, mutate):
+        """Apply mutate to a copy of the product's site only."""
+        site = self.site_of(product_id)
+        if site is None:
+            return None
+        new_df = self._partitions[site].update(mutate)
+        if new_df is not None:
+            with self._lock:
+                self._version += 1
+        return new_df
+
+    def sync(self):
+        """Pick up site files rewritten by other processes."""
+        if not self._generations or time.monotonic() - self._checked_at < self._sync_interval:
+            return
+        self._checked_at = time.monotonic()
+        generation = self._generations.total()
+        if generation == self._generation:
+            return
+        self._generation = generation
+        generations = self._generations.all()
+        reloaded = [site for site, store in self._partitions.items() if store.reload_if_changed(generations)]
+        if reloaded:
+            with self._lock:
+                self._version += 1
+
+    def snapshot(self):
+        self.sync()
+        combined = self._combined
+        if combined is not None and combined[0] == self._version:
+            return combined[1]
+        with self._lock:
+            version = self._version
+            if self._combined is None or self._combined[0] != version:
+                frames = [self._batch_frame(batch) for batch in self._batches]
+                df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+                self._combined = (version, df)
+                self._derived = {}
+            return self._combined[1]
+
+    def _batch(self, sites):
+        """Split sites, in order, into batches of about _batch_rows rows each."""
+        batches, batch, rows = [], [], 0
+        for site in sites:
+            batch.append(site)
+            rows += len(self._partitions[site].snapshot())
+            if rows >= self._batch_rows:
+                batches.append(tuple(batch))
+                batch, rows = [], 0
+        if batch:
+            batches.append(tuple(batch))
+        return batches
+
+    def _batch_frame(self, batch):
+        """Concatenated snapshots of batch, reused while none of them changed."""
+        snapshots = [self._partitions[site].snapshot() for site in batch]
+        cached = self._batch_frames.get(batch)
+        if cached is not None and all(a is b for a, b in zip(cached[0], snapshots)):
+            return cached[1]
+        df = snapshots[0] if len(snapshots) == 1 else pd.concat(snapshots, ignore_index=True)
+        self._batch_frames[batch] = (snapshots, df)
+        return df
+
+    def derived(self, name, compute):
+        snapshot = self.snapshot()
+        cache = self._derived
+        entry = cache.get(name)
+        if entry is not None and entry[0] is snapshot:
+            return entry[1]
+        result = compute(snapshot)
+        cache[name] = (snapshot, result)
+        return result
+
+    def map_partitions(self, fn, sites=None):
+        """Run fn(site, snapshot) for each site, one pool task per batch; returns {site: result}."""
+        self.sync()
+        batches = self._batches if sites is None else self._batch(sites)
+        futures = [
+            self._executor.submit(_map_batch, fn, [(site, self._partitions[site].snapshot()) for site in batch])
+            for batch in batches
+        ]
+        results = {}
+        for future in futures:
+            results.update(future.result())
+        return results
+
+    def map_batches(self, fn, sites=None):
+        """Run fn(snapshot) on each batch of sites in parallel; returns the results in order.
+
+        For scans that need no per-site breakdown: fn sees one frame per
+        batch, so many small sites cost one vectorized call instead of one each.
+        """
+        self.sync()
+        batches = self._batches if sites is None else self._batch(sites)
+        with self._lock:
+            frames = [self._batch_frame(batch) for batch in batches]
+        return list(self._executor.map(fn, frames))
+
+    def summaries(self, summarize):
+        """Per-site summarize(snapshot), cached inside each site's store."""
+        self.sync()
+        return {site: store.derived('summary', summarize) for site, store in self._partitions.items()}
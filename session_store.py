@@ -0,0 +1,90 @@
+import json
+import secrets
+import sqlite3
+import time
+
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+
+class ServerSession(CallbackDict, SessionMixin):
+    def __init__(self, initial=None, sid=None):
+        def on_update(self):
+            self.modified = True
+        CallbackDict.__init__(self, initial, on_update)
+        self.sid = sid
+        self.new = sid is None
+        self.modified = False
+        self.rotate = False
+
+    def regenerate(self):
+        """Issue a new session id on save (call after login)."""
+        self.rotate = True
+        self.modified = True
+
+# ==========================
+# Server-side Session Store
+# ==========================
+class SqliteSessionInterface(SessionInterface):
+    """Keeps session data in SQLite; the cookie only carries a random id.
+
+    Sessions are written only when modified, so ordinary page views cost one
+    primary-key lookup and send no Set-Cookie header.
+    """
+
+    def __init__(self, db_path, lifetime=7 * 24 * 3600):
+        self.db_path = db_path
+        self.lifetime = lifetime
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+        cursor.execute("""CREATE TABLE IF NOT EXISTS sessions (
+                          sid TEXT PRIMARY KEY,
+                          data TEXT,
+                          expires_at REAL
+                          )""")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_expiry ON sessions (expires_at)")
+        conn.commit()
+        conn.close()
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute("SELECT data FROM sessions WHERE sid=? AND expires_at>?", (sid, time.time()))
+            row = cursor.fetchone()
+            conn.close()
+            if row:
+                return ServerSession(json.loads(row[0]), sid=sid)
+        return ServerSession()
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        if not session.modified:
+            return
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        if session.sid and (session.rotate or not session):
+            cursor.execute("DELETE FROM sessions WHERE sid=?", (session.sid,))
+        if not session:
+            conn.commit()
+            conn.close()
+            if session.sid:
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        if session.sid is None or session.rotate:
+            session.sid = secrets.token_urlsafe(32)
+            session.rotate = False
+        expires_at = time.time() + self.lifetime
+        cursor.execute("INSERT OR REPLACE INTO sessions (sid, data, expires_at) VALUES (?,?,?)",
+                       (session.sid, json.dumps(dict(session)), expires_at))
+        cursor.execute("DELETE FROM sessions WHERE expires_at<?", (time.time(),))
+        conn.commit()
+        conn.close()
+        response.set_cookie(name, session.sid, max_age=self.lifetime, domain=domain, path=path,
+                            httponly=self.get_cookie_httponly(app), secure=self.get_cookie_secure(app),
+                            samesite=self.get_cookie_samesite(app))
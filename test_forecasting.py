@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+from forecasting import FEATURE_COLUMNS, build_lag_history, horizon_forecast
+
+# The recursive forecast must feed the model the same Lag_1/2/3/6 features
+# train_model.py builds with groupby().shift(): checked with a probe model
+# whose output encodes the lags it was given.
+
+LAGS = [1, 2, 3, 6]
+
+
+class ProbeModel:
+    def predict(self, X):
+        assert list(X.columns) == FEATURE_COLUMNS
+        return encode(X)
+
+def encode(X):
+    return (X['Lag_1'] + 1e2 * X['Lag_2'] + 1e4 * X['Lag_3'] + 1e6 * X['Lag_6']).to_numpy()
+
+
+def monthly_frame(units_by_product, start="2024-01-31"):
+    frames = []
+    for pid, units in units_by_product.items():
+        frames.append(pd.DataFrame({
+            'Product_ID': pid,
+            'Product_Name': f"Product {pid}",
+            'Category': "Test",
+            'Date': pd.date_range(start, periods=len(units), freq='ME'),
+            'Units_Sold': units,
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+def training_lags(dates, units):
+    """Lags of the last row, exactly as train_model.py computes them."""
+    df = pd.DataFrame({'Product_ID': 'p', 'Date': dates, 'Units_Sold': units})
+    for lag in LAGS:
+        df[f'Lag_{lag}'] = df.groupby('Product_ID')['Units_Sold'].shift(lag)
+    return df.iloc[[-1]]
+
+
+def test_rollout_matches_training_lags():
+    units = [3, 1, 4, 1, 5, 9, 2, 6]
+    monthly = monthly_frame({'A': units, 'B': [7, 7, 7, 7], 'C': [2, 7, 1, 8, 2, 8]})
+    forecast = horizon_forecast(ProbeModel(), monthly, 2)
+
+    # Fewer than six months of sales: no complete lag row, left out
+    assert set(forecast['Product_ID']) == {'A', 'C'}
+
+    for pid in ['A', 'C']:
+        history = monthly[monthly['Product_ID'] == pid]
+        dates = list(history['Date'])
+        series = list(history['Units_Sold'].astype(float))
+        rows = forecast[forecast['Product_ID'] == pid].sort_values('Step')
+        for step, row in zip([1, 2], rows.itertuples()):
+            target = dates[-1] + pd.offsets.MonthEnd(1)
+            expected = encode(training_lags(dates + [target], series + [np.nan]))[0]
+            assert row.Predicted_Sales == expected, (pid, step)
+            assert (row.Year, row.Month) == (target.year, target.month)
+            # The next step sees this prediction as the newest month
+            dates.append(target)
+            series.append(expected)
+
+
+def test_history_is_last_six_months_oldest_first():
+    monthly = monthly_frame({'A': [3, 1, 4, 1, 5, 9, 2, 6], 'B': [7, 7, 7, 7]})
+    products, history = build_lag_history(monthly)
+    assert list(products['Product_ID']) == ['A']
+    assert history.tolist() == [[4, 1, 5, 9, 2, 6]]
+    assert products['Period'].iloc[0] == 2024 * 12 + 8 - 1
+
+
+if __name__ == "__main__":
+    test_rollout_matches_training_lags()
+    test_history_is_last_six_months_oldest_first()
+    print("Forecasting lag alignment tests passed")
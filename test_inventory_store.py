@@ -0,0 +1,109 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import pandas as pd
+
+from inventory_store import InventoryStore, apply_stock_change
+from partitioned_inventory import PartitionedInventory
+
+# Stress test for the copy-on-write inventory stores: N writer threads apply
+# +1 stock changes K times while M reader threads keep taking snapshots.
+# Every read must see the whole catalog and no write may be lost.
+
+WRITERS = 5
+READERS = 5
+CHANGES_PER_WRITER = 50
+INVENTORY_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "inventory_data.csv")
+
+
+def stress(store, update, product_id):
+    rows = len(store.snapshot())
+    start = int(store.snapshot().set_index('Product_ID').loc[product_id, 'Stock_Quantity'])
+    done = threading.Event()
+    torn_reads = []
+
+    def writer():
+        for _ in range(CHANGES_PER_WRITER):
+            update(lambda df: apply_stock_change(df, product_id, 1))
+
+    def reader():
+        while not done.is_set():
+            df = store.snapshot()
+            if len(df) != rows:
+                torn_reads.append(len(df))
+            time.sleep(0.001)
+
+    readers = [threading.Thread(target=reader) for _ in range(READERS)]
+    writers = [threading.Thread(target=writer) for _ in range(WRITERS)]
+    for t in readers + writers:
+        t.start()
+    for t in writers:
+        t.join()
+    done.set()
+    for t in readers:
+        t.join()
+
+    final = int(store.snapshot().set_index('Product_ID').loc[product_id, 'Stock_Quantity'])
+    assert not torn_reads, f"readers saw partial snapshots: {torn_reads[:5]}"
+    assert final == start + WRITERS * CHANGES_PER_WRITER, (start, final)
+    return final
+
+
+def test_inventory_store_interleaving():
+    tmp = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmp, "inventory_data.csv")
+        shutil.copy(INVENTORY_CSV, path)
+        store = InventoryStore.from_csv(path)
+        product_id = store.snapshot()['Product_ID'].iloc[0]
+        final = stress(store, store.update, product_id)
+
+        # The persisted file holds the last published snapshot
+        on_disk = pd.read_csv(path, dtype={'Product_ID': str}).set_index('Product_ID')
+        assert int(on_disk.loc[product_id, 'Stock_Quantity']) == final
+    finally:
+        shutil.rmtree(tmp)
+
+
+def test_stores_sharing_a_file():
+    # Two stores on one file stand in for two worker processes
+    tmp = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmp, "inventory_data.csv")
+        shutil.copy(INVENTORY_CSV, path)
+        first, second = InventoryStore.from_csv(path), InventoryStore.from_csv(path)
+        product_id = first.snapshot()['Product_ID'].iloc[0]
+        start = int(first.snapshot().set_index('Product_ID').loc[product_id, 'Stock_Quantity'])
+
+        # Back-to-back rewrites land within one mtime tick; each must be seen
+        for _ in range(CHANGES_PER_WRITER):
+            first.update(lambda df: apply_stock_change(df, product_id, 1))
+            assert second.reload_if_changed()
+            second.update(lambda df: apply_stock_change(df, product_id, 1))
+            assert first.reload_if_changed()
+
+        for store in (first, second):
+            final = int(store.snapshot().set_index('Product_ID').loc[product_id, 'Stock_Quantity'])
+            assert final == start + 2 * CHANGES_PER_WRITER, (start, final)
+    finally:
+        shutil.rmtree(tmp)
+
+
+def test_partitioned_inventory_interleaving():
+    tmp = tempfile.mkdtemp()
+    try:
+        store = PartitionedInventory.load(INVENTORY_CSV, os.path.join(tmp, "partitions"))
+        product_id = store.snapshot()['Product_ID'].iloc[0]
+        stress(store, lambda mutate: store.update_product(product_id, mutate), product_id)
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    test_inventory_store_interleaving()
+    test_stores_sharing_a_file()
+    test_partitioned_inventory_interleaving()
+    print("Inventory store stress test passed")
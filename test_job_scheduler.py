@@ -0,0 +1,67 @@
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+# Two processes race for the scheduler lock; when the holder dies the other
+# one must take over without being restarted (as on a gunicorn reload).
+
+CONTENDER = """
+import os, sys, time
+from job_scheduler import acquire_or_wait
+
+def on_acquired():
+    with open(sys.argv[2], 'a') as f:
+        f.write(f"{os.getpid()}\\n")
+
+lock = acquire_or_wait(sys.argv[1], on_acquired)
+time.sleep(60)
+"""
+
+
+def started(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [int(line) for line in f.read().split()]
+
+def wait_for(path, count, timeout=15):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        pids = started(path)
+        if len(pids) >= count:
+            return pids
+        time.sleep(0.05)
+    return started(path)
+
+
+def test_waiting_process_takes_over_lock():
+    tmp = tempfile.mkdtemp()
+    lock_path, log_path = os.path.join(tmp, "scheduler.lock"), os.path.join(tmp, "started.log")
+    here = os.path.dirname(os.path.abspath(__file__))
+    procs = [subprocess.Popen([sys.executable, "-c", CONTENDER, lock_path, log_path], cwd=here)
+             for _ in range(2)]
+    try:
+        first = wait_for(log_path, 1)
+        time.sleep(0.5)
+        assert len(started(log_path)) == 1, "both processes got the lock"
+
+        holder = next(p for p in procs if p.pid == first[0])
+        holder.send_signal(signal.SIGKILL)
+        holder.wait()
+
+        pids = wait_for(log_path, 2)
+        survivor = next(p for p in procs if p is not holder)
+        assert pids == [holder.pid, survivor.pid], pids
+    finally:
+        for p in procs:
+            if p.poll() is None:
+                p.kill()
+                p.wait()
+
+
+if __name__ == "__main__":
+    test_waiting_process_takes_over_lock()
+    print("Scheduler lock takeover test passed")
@@ -0,0 +1,55 @@
+import sqlite3
+import threading
+import time
+
+
+# ==========================
+# In-process User Cache
+# ==========================
+class UserCache:
+    """All user records loaded with one query and kept in memory.
+
+    Routes look users up by id and alert jobs read the recipient list from
+    here instead of querying SQLite every run. invalidate() is called on
+    signup; the TTL bounds staleness when another process adds a user.
+    """
+
+    def __init__(self, db_path, ttl=300):
+        self.db_path = db_path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._users = None
+        self._loaded_at = 0.0
+
+    def _load(self):
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute("SELECT id,username,email,gmail_password FROM users")
+        rows = cursor.fetchall()
+        conn.close()
+        return {u[0]: {"id": u[0], "username": u[1], "email": u[2], "gmail_password": u[3]} for u in rows}
+
+    def _current(self):
+        users = self._users
+        if users is not None and time.monotonic() - self._loaded_at < self.ttl:
+            return users
+        with self._lock:
+            if self._users is None or time.monotonic() - self._loaded_at >= self.ttl:
+                self._users = self._load()
+                self._loaded_at = time.monotonic()
+            return self._users
+
+    def get(self, user_id):
+        user = self._current().get(user_id)
+        if user is None and user_id is not None:
+            # Possibly created by another worker since the last load
+            self.invalidate()
+            user = self._current().get(user_id)
+        return user
+
+    def all(self):
+        return list(self._current().values())
+
+    def invalidate(self):
+        with self._lock:
+            self._users = None
@@ -0,0 +1,6 @@
+from app import create_app
+
+# Entry point for production servers, e.g.
+#   gunicorn -c gunicorn.conf.py wsgi:app
+# The scheduler is started from gunicorn.conf.py in one worker only.
+app = create_app()